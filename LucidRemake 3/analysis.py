@@ -0,0 +1,235 @@
+import json
+from datetime import date, timedelta
+import numpy as np
+from sqlalchemy import select
+from models import IndicatorData, MetricData, StockPriceData
+from app import db
+
+# Limits for the batch analyzer
+MAX_BATCH_SYMBOLS = 5000
+BATCH_CHUNK_SIZE = 250
+DEFAULT_MAX_LAG = 5
+MAX_LAG = 30
+MIN_OBSERVATIONS = 20
+# Prices loaded before the first signal date, enough to forward fill over weekends and holidays
+PRICE_LOOKBACK_DAYS = 14
+UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _is_int(value):
+    """True for JSON integers; bools are ints in Python but not here"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def parse_batch_request(payload):
+    """Validate a batch analyze payload, raising ValueError with a user-facing message"""
+    if not isinstance(payload, dict):
+        raise ValueError('Expected a JSON object')
+
+    indicator_id = payload.get('indicator_id')
+    metric_id = payload.get('metric_id')
+    max_lag = payload.get('max_lag', DEFAULT_MAX_LAG)
+
+    symbols = payload.get('symbols')
+    if not isinstance(symbols, list):
+        raise ValueError('Provide a non-empty list of symbols')
+    if not all(isinstance(symbol, str) for symbol in symbols):
+        raise ValueError('Symbols must be strings')
+    # Normalize and de-duplicate while keeping the caller's order
+    symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+    if not symbols:
+        raise ValueError('Provide a non-empty list of symbols')
+    if len(symbols) > MAX_BATCH_SYMBOLS:
+        raise ValueError(f'At most {MAX_BATCH_SYMBOLS} symbols per batch')
+    if (indicator_id is None) == (metric_id is None):
+        raise ValueError('Provide exactly one of indicator_id or metric_id')
+    if not _is_int(indicator_id if indicator_id is not None else metric_id):
+        raise ValueError('indicator_id and metric_id must be integers')
+    if not _is_int(max_lag) or not 0 <= max_lag <= MAX_LAG:
+        raise ValueError(f'max_lag must be an integer between 0 and {MAX_LAG}')
+
+    return symbols, indicator_id, metric_id, max_lag
+
+
+def signal_query(indicator_id=None, metric_id=None):
+    """Select the date-ordered value series for an indicator or metric"""
+    # Core table columns skip ORM row processing, which dominates on large results
+    if indicator_id is not None:
+        table = IndicatorData.__table__
+        return (select(table.c.date, table.c.value)
+                .where(table.c.indicator_id == indicator_id)
+                .order_by(table.c.date))
+    table = MetricData.__table__
+    return (select(table.c.date, table.c.value)
+            .where(table.c.metric_id == metric_id)
+            .order_by(table.c.date))
+
+
+def _to_datetime64(dates):
+    """Convert date objects to datetime64[D] via ordinals, much faster than numpy's own parsing"""
+    ordinals = np.fromiter((d.toordinal() for d in dates), dtype=np.int64, count=len(dates))
+    return (ordinals - UNIX_EPOCH_ORDINAL).astype('datetime64[D]')
+
+
+def signal_arrays(rows):
+    """Convert (date, value) rows into numpy arrays"""
+    dates = _to_datetime64([row[0] for row in rows])
+    values = np.array([row[1] for row in rows], dtype=float)
+    return dates, values
+
+
+def price_query(symbols, first_date, last_date):
+    """Select closing prices for symbols over the signal's date range"""
+    table = StockPriceData.__table__
+    return (select(table.c.symbol, table.c.date, table.c.close)
+            .where(table.c.symbol.in_(symbols))
+            .where(table.c.date >= first_date - timedelta(days=PRICE_LOOKBACK_DAYS))
+            .where(table.c.date <= last_date)
+            .order_by(table.c.date))
+
+
+def align_prices(rows, symbols, dates):
+    """Align (symbol, date, close) rows onto the signal dates.
+
+    Returns a (len(dates), len(symbols)) matrix where each cell holds the
+    last close on or before that date, or NaN if there is none.
+    """
+    column = {symbol: i for i, symbol in enumerate(symbols)}
+    aligned = np.full((len(dates), len(symbols)), np.nan)
+    if not rows:
+        return aligned
+
+    price_dates = _to_datetime64([row[1] for row in rows])
+    unique_dates, date_index = np.unique(price_dates, return_inverse=True)
+    symbol_index = np.array([column[row[0]] for row in rows])
+
+    prices = np.full((len(unique_dates), len(symbols)), np.nan)
+    prices[date_index, symbol_index] = [row[2] for row in rows]
+
+    # Forward fill along the date axis so gaps take the previous close
+    filled_rows = np.where(~np.isnan(prices), np.arange(len(unique_dates))[:, None], 0)
+    np.maximum.accumulate(filled_rows, axis=0, out=filled_rows)
+    prices = prices[filled_rows, np.arange(len(symbols))]
+
+    # Pick the last available row on or before each signal date
+    positions = np.searchsorted(unique_dates, dates, side='right') - 1
+    has_price = positions >= 0
+    aligned[has_price] = prices[positions[has_price]]
+    return aligned
+
+
+def load_signal_series(indicator_id=None, metric_id=None):
+    """Load the date-ordered value series for an indicator or metric"""
+    rows = db.session.execute(signal_query(indicator_id, metric_id)).all()
+    return signal_arrays(rows)
+
+
+def _pct_change(values):
+    """Period-over-period percentage change along the first axis"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = values[1:] / values[:-1] - 1.0
+    change[~np.isfinite(change)] = np.nan
+    return change
+
+
+def _lagged_stats(signal, returns):
+    """Correlation, beta and hit rate of each returns column against signal"""
+    mask = ~np.isnan(returns) & ~np.isnan(signal)[:, None]
+    count = mask.sum(axis=0)
+
+    x = np.where(mask, signal[:, None], 0.0)
+    y = np.where(mask, returns, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean = x.sum(axis=0) / count
+        y_mean = y.sum(axis=0) / count
+        x_dev = np.where(mask, x - x_mean, 0.0)
+        y_dev = np.where(mask, y - y_mean, 0.0)
+
+        cov = (x_dev * y_dev).sum(axis=0)
+        x_var = (x_dev ** 2).sum(axis=0)
+        y_var = (y_dev ** 2).sum(axis=0)
+
+        correlation = cov / np.sqrt(x_var * y_var)
+        beta = cov / x_var
+        hits = (mask & (np.sign(x) == np.sign(y)) & (x != 0)).sum(axis=0)
+        hit_rate = hits / count
+
+    too_few = count < MIN_OBSERVATIONS
+    correlation[too_few] = np.nan
+    beta[too_few] = np.nan
+    hit_rate[too_few] = np.nan
+    return correlation, beta, hit_rate, count
+
+
+def compute_batch_stats(signal_values, prices, max_lag=DEFAULT_MAX_LAG):
+    """Vectorized correlation, lag, beta and hit rate for a price matrix.
+
+    The signal is allowed to lead prices by 0..max_lag periods; for each
+    symbol the lag with the strongest absolute correlation is reported.
+    The lag is capped at a quarter of the series so every candidate lag
+    keeps most of the observations.
+    """
+    signal = _pct_change(signal_values)
+    returns = _pct_change(prices)
+    periods, symbol_count = returns.shape
+
+    best = {
+        'correlation': np.full(symbol_count, np.nan),
+        'lag': np.zeros(symbol_count, dtype=int),
+        'beta': np.full(symbol_count, np.nan),
+        'hit_rate': np.full(symbol_count, np.nan),
+        'observations': np.zeros(symbol_count, dtype=int),
+    }
+
+    for lag in range(min(max_lag, periods // 4) + 1):
+        correlation, beta, hit_rate, count = _lagged_stats(signal[:periods - lag], returns[lag:])
+        current = np.abs(best['correlation'])
+        better = ~np.isnan(correlation) & (np.isnan(current) | (np.abs(correlation) > current))
+
+        best['correlation'][better] = correlation[better]
+        best['lag'][better] = lag
+        best['beta'][better] = beta[better]
+        best['hit_rate'][better] = hit_rate[better]
+        best['observations'][better] = count[better]
+
+    return best
+
+
+def _to_json_number(value, digits=4):
+    """Round a float for output, mapping NaN to None"""
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def analyze_chunk(chunk, price_rows, signal_dates, signal_values, max_lag=DEFAULT_MAX_LAG):
+    """Run the batch stats for one chunk of symbols and format it as NDJSON"""
+    prices = align_prices(price_rows, chunk, signal_dates)
+    stats = compute_batch_stats(signal_values, prices, max_lag)
+
+    lines = []
+    for i, symbol in enumerate(chunk):
+        if np.isnan(stats['correlation'][i]):
+            result = {'symbol': symbol, 'error': 'Insufficient price data'}
+        else:
+            result = {
+                'symbol': symbol,
+                'correlation': _to_json_number(stats['correlation'][i]),
+                'lag': int(stats['lag'][i]),
+                'beta': _to_json_number(stats['beta'][i]),
+                'hit_rate': _to_json_number(stats['hit_rate'][i]),
+                'observations': int(stats['observations'][i]),
+            }
+        lines.append(json.dumps(result))
+    return '\n'.join(lines) + '\n'
+
+
+def symbol_chunks(symbols):
+    """Split symbols into BATCH_CHUNK_SIZE pieces"""
+    return [symbols[start:start + BATCH_CHUNK_SIZE] for start in range(0, len(symbols), BATCH_CHUNK_SIZE)]
+
+
+def stream_batch_analysis(symbols, signal_dates, signal_values, max_lag=DEFAULT_MAX_LAG):
+    """Yield one NDJSON line per symbol, processing symbols in chunks"""
+    first_date, last_date = signal_dates[0].item(), signal_dates[-1].item()
+    for chunk in symbol_chunks(symbols):
+        price_rows = db.session.execute(price_query(chunk, first_date, last_date)).all()
+        yield analyze_chunk(chunk, price_rows, signal_dates, signal_values, max_lag)
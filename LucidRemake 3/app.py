@@ -3,6 +3,7 @@ import logging
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase
+from db_pool import RoutingSession, REPLICA_BIND_KEY, engine_options
 
 # Set up logging for debugging
 logging.basicConfig(level=logging.DEBUG)
@@ -10,7 +11,7 @@ logging.basicConfig(level=logging.DEBUG)
 class Base(DeclarativeBase):
     pass
 
-db = SQLAlchemy(model_class=Base)
+db = SQLAlchemy(model_class=Base, session_options={"class_": RoutingSession})
 
 # Create the Flask app
 app = Flask(__name__)
@@ -18,10 +19,16 @@ app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key-change-in-prod
 
 # Configure the database
 app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL")
-app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-    "pool_recycle": 300,
-    "pool_pre_ping": True,
-}
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(os.environ.get("DATABASE_URL"))
+
+# Optional read replica for list and series queries
+if os.environ.get("DATABASE_REPLICA_URL"):
+    app.config["SQLALCHEMY_BINDS"] = {
+        REPLICA_BIND_KEY: {
+            "url": os.environ.get("DATABASE_REPLICA_URL"),
+            **engine_options(os.environ.get("DATABASE_REPLICA_URL")),
+        }
+    }
 
 # Initialize the database extension
 db.init_app(app)
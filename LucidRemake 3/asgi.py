@@ -0,0 +1,104 @@
+import os
+import asyncio
+import anyio
+from contextlib import asynccontextmanager
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Mount, Route
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app import app as flask_app, db
+from db_pool import TimedAsyncQueuePool, async_database_url, engine_options, pool_stats
+from analysis import parse_batch_request, signal_query, signal_arrays, price_query, symbol_chunks, analyze_chunk
+
+# The async endpoints only read, so they use the replica when one is configured
+read_url = os.environ.get("DATABASE_REPLICA_URL") or os.environ.get("DATABASE_URL")
+read_engine = create_async_engine(
+    async_database_url(read_url),
+    **engine_options(read_url, poolclass=TimedAsyncQueuePool)
+)
+read_session = async_sessionmaker(read_engine, expire_on_commit=False)
+
+
+async def fetch_all(session, statement):
+    """Run a query to completion even if the request is cancelled meanwhile.
+
+    Starlette cancels a streaming response when the client disconnects. A
+    query interrupted by that makes SQLAlchemy terminate the connection,
+    so queries are shielded and the cancellation lands at the next yield.
+    """
+    with anyio.CancelScope(shield=True):
+        return (await session.execute(statement)).all()
+
+
+async def close_session(session):
+    """Return the session's connection to the pool, shielded like fetch_all"""
+    with anyio.CancelScope(shield=True):
+        await session.close()
+
+
+async def health(request):
+    return JSONResponse({'status': 'ok', 'message': 'LucidQuant ASGI app is running!'})
+
+
+async def analyze_batch(request):
+    """Async version of the batch analyze endpoint, streamed as NDJSON"""
+    try:
+        payload = await request.json()
+    except ValueError:
+        payload = {}
+    try:
+        symbols, indicator_id, metric_id, max_lag = parse_batch_request(payload)
+    except ValueError as e:
+        return JSONResponse({'error': str(e)}, status_code=400)
+
+    # One session (and pooled connection) serves the whole request, so a
+    # streaming response never queues behind other requests for a second one
+    session = read_session()
+    try:
+        rows = await fetch_all(session, signal_query(indicator_id, metric_id))
+    except Exception:
+        await close_session(session)
+        raise
+    signal_dates, signal_values = signal_arrays(rows)
+    if len(signal_values) < 2:
+        await close_session(session)
+        return JSONResponse({'error': 'Not enough data for the selected indicator or metric'}, status_code=404)
+
+    async def stream():
+        first_date, last_date = signal_dates[0].item(), signal_dates[-1].item()
+        try:
+            for chunk in symbol_chunks(symbols):
+                price_rows = await fetch_all(session, price_query(chunk, first_date, last_date))
+                # Keep the numpy work off the event loop so other requests are served meanwhile
+                yield await asyncio.to_thread(analyze_chunk, chunk, price_rows, signal_dates, signal_values, max_lag)
+        finally:
+            await close_session(session)
+
+    return StreamingResponse(stream(), media_type='application/x-ndjson')
+
+
+async def pool_stats_view(request):
+    """Pool usage for the WSGI engines plus the async read engine"""
+    with flask_app.app_context():
+        stats = pool_stats(db.engines)
+    stats.update(pool_stats({'async_read': read_engine.sync_engine}))
+    return JSONResponse(stats)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await read_engine.dispose()
+
+
+# JSON data endpoints are served natively; everything else falls through to Flask
+app = Starlette(
+    routes=[
+        Route('/health', health),
+        Route('/api/analyze/batch', analyze_batch, methods=['POST']),
+        Route('/admin/pool-stats', pool_stats_view),
+        Mount('/', WSGIMiddleware(flask_app)),
+    ],
+    lifespan=lifespan,
+)
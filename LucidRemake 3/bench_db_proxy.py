@@ -0,0 +1,73 @@
+"""TCP proxy that adds network latency in front of a local database.
+
+Used with bench_load.py to approximate a hosted database, where each
+query pays a network round trip, e.g.:
+
+    python bench_db_proxy.py --listen 6432 --target 127.0.0.1:5432 --delay-ms 1
+    DATABASE_URL=postgresql://postgres@127.0.0.1:6432/lucid uvicorn asgi:app
+
+--delay-ms is applied in each direction, so the added round trip is twice that.
+"""
+import argparse
+import asyncio
+import time
+
+
+async def pipe(reader, writer, delay):
+    """Forward bytes after a fixed delay without limiting throughput"""
+    queue = asyncio.Queue()
+
+    async def send():
+        while True:
+            deadline, data = await queue.get()
+            wait = deadline - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+        writer.close()
+
+    sender = asyncio.create_task(send())
+    try:
+        while True:
+            data = await reader.read(65536)
+            queue.put_nowait((time.monotonic() + delay, data))
+            if not data:
+                break
+    except ConnectionError:
+        queue.put_nowait((time.monotonic(), b''))
+    await sender
+
+
+async def handle(client_reader, client_writer, target_host, target_port, delay):
+    server_reader, server_writer = await asyncio.open_connection(target_host, target_port)
+    await asyncio.gather(
+        pipe(client_reader, server_writer, delay),
+        pipe(server_reader, client_writer, delay),
+        return_exceptions=True,
+    )
+
+
+async def serve(args):
+    host, port = args.target.rsplit(':', 1)
+    server = await asyncio.start_server(
+        lambda r, w: handle(r, w, host, int(port), args.delay_ms / 1000),
+        '127.0.0.1', args.listen,
+    )
+    print(f"Proxying 127.0.0.1:{args.listen} -> {args.target} with {args.delay_ms} ms each way")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--listen', type=int, default=6432)
+    parser.add_argument('--target', default='127.0.0.1:5432')
+    parser.add_argument('--delay-ms', type=float, default=1.0)
+    asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
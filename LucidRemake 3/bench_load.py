@@ -0,0 +1,81 @@
+"""Load benchmark for the JSON data endpoints.
+
+Fires concurrent requests at a running server so the WSGI and ASGI modes
+can be compared, e.g.:
+
+    gunicorn --bind 127.0.0.1:5000 main:app
+    uvicorn asgi:app --port 8000
+
+    python bench_load.py http://127.0.0.1:5000/api/analyze/batch --indicator-id 1 --symbols AAPL,MSFT
+    python bench_load.py http://127.0.0.1:8000/api/analyze/batch --indicator-id 1 --symbols AAPL,MSFT
+"""
+import argparse
+import asyncio
+import time
+import httpx
+
+
+async def worker(client, args, latencies, errors, remaining):
+    while remaining:
+        remaining.pop()
+        started = time.perf_counter()
+        try:
+            if args.payload is None:
+                response = await client.get(args.url)
+            else:
+                response = await client.post(args.url, json=args.payload)
+            await response.aread()
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+            else:
+                latencies.append(time.perf_counter() - started)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run(args):
+    latencies, errors = [], []
+    remaining = list(range(args.requests))
+    limits = httpx.Limits(max_connections=args.concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=args.timeout) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client, args, latencies, errors, remaining) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"URL:          {args.url}")
+    print(f"Concurrency:  {args.concurrency}")
+    print(f"Requests:     {args.requests} ({len(errors)} failed)")
+    print(f"Throughput:   {len(latencies) / elapsed:.1f} req/s")
+    print(f"Latency p50:  {percentile(latencies, 0.50) * 1000:.1f} ms")
+    print(f"Latency p95:  {percentile(latencies, 0.95) * 1000:.1f} ms")
+    print(f"Latency p99:  {percentile(latencies, 0.99) * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('url')
+    parser.add_argument('-c', '--concurrency', type=int, default=100)
+    parser.add_argument('-n', '--requests', type=int, default=2000)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--indicator-id', type=int, help='POST a batch analyze payload for this indicator')
+    parser.add_argument('--symbols', default='', help='Comma-separated symbols for the batch payload')
+    args = parser.parse_args()
+
+    args.payload = None
+    if args.indicator_id is not None:
+        args.payload = {'indicator_id': args.indicator_id, 'symbols': [s for s in args.symbols.split(',') if s]}
+
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
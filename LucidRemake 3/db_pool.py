@@ -0,0 +1,158 @@
+import os
+import time
+import logging
+import threading
+from functools import wraps
+from flask import g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Select
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
+
+# Bind key used for the read-only replica engine
+REPLICA_BIND_KEY = 'replica'
+
+# Async drivers used by the ASGI app for each database backend
+ASYNC_DRIVERS = {
+    'postgres': 'postgresql+asyncpg',
+    'postgresql': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+# Query parameters asyncpg accepts as strings from a URL; libpq-only ones
+# such as channel_binding would make asyncpg.connect raise a TypeError
+ASYNCPG_URL_PARAMS = {'ssl', 'target_session_attrs', 'passfile', 'krbsrvname', 'gsslib',
+                      'prepared_statement_cache_size'}
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each connection checkout takes.
+
+    The time covers waiting for a free connection when the pool is full
+    and opening a new connection when it is not, so it is the latency a
+    request sees before it can run its first query.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._checkout_lock = threading.Lock()
+        self._checkout_count = 0
+        self._checkout_total = 0.0
+        self._checkout_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._checkout_lock:
+                self._checkout_count += 1
+                self._checkout_total += elapsed
+                self._checkout_max = max(self._checkout_max, elapsed)
+
+    def checkout_stats(self):
+        """Checkout count and checkout times in milliseconds"""
+        with self._checkout_lock:
+            count, total, longest = self._checkout_count, self._checkout_total, self._checkout_max
+        return {
+            'checkouts': count,
+            'avg_checkout_ms': round(total / count * 1000, 3) if count else 0.0,
+            'max_checkout_ms': round(longest * 1000, 3),
+        }
+
+
+class TimedAsyncQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    """TimedQueuePool for asyncio engines"""
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the replica bind inside read-only views.
+
+    Flushes and INSERT/UPDATE/DELETE statements always go to the primary,
+    so writes such as ``DataFetcher.populate_database`` are unaffected.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None
+                and not self._flushing
+                and isinstance(clause, Select)
+                and has_app_context()
+                and g.get('use_read_replica')):
+            replica = self._db.engines.get(REPLICA_BIND_KEY)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def read_replica(view):
+    """Route the SELECT queries of a view to the read replica, if configured"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # Stored on g so streamed responses keep reading from the replica
+        g.use_read_replica = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def engine_options(database_url, poolclass=TimedQueuePool):
+    """Build SQLALCHEMY_ENGINE_OPTIONS from DB_POOL_* environment variables"""
+    options = {
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 300)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes'),
+    }
+
+    # In-memory SQLite uses a single static connection, so sizing does not apply
+    in_memory = database_url in ('sqlite://', 'sqlite:///') or ':memory:' in (database_url or '')
+    if database_url and not in_memory:
+        options.update({
+            'poolclass': poolclass,
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+            'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        })
+    return options
+
+
+def async_database_url(database_url):
+    """Rewrite a DATABASE_URL to use the matching async driver.
+
+    For asyncpg, libpq's ``sslmode`` becomes ``ssl`` and any other query
+    parameter asyncpg does not understand is dropped with a warning.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    url = url.set(drivername=ASYNC_DRIVERS.get(backend, url.drivername))
+    if url.drivername != 'postgresql+asyncpg':
+        return url
+
+    query = dict(url.query)
+    if 'sslmode' in query:
+        query.setdefault('ssl', query.pop('sslmode'))
+    dropped = sorted(set(query) - ASYNCPG_URL_PARAMS)
+    if dropped:
+        logger.warning(f"Ignoring database URL parameters not supported by asyncpg: {', '.join(dropped)}")
+    return url.set(query={key: value for key, value in query.items() if key in ASYNCPG_URL_PARAMS})
+
+
+def pool_stats(engines):
+    """Snapshot of connection pool usage for a mapping of bind key to engine"""
+    stats = {}
+    for key, engine in engines.items():
+        pool = engine.pool
+        entry = {'pool_class': type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            entry.update({
+                'size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                # SQLAlchemy counts down from -pool_size until the pool is full
+                'overflow': max(0, pool.overflow()),
+                'timeout': pool.timeout(),
+            })
+        if isinstance(pool, TimedQueuePool):
+            entry.update(pool.checkout_stats())
+        stats[key or 'primary'] = entry
+    return stats
@@ -42,4 +42,13 @@ class MetricData(db.Model):
     date = db.Column(db.Date, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    metric = db.relationship('Metric', backref=db.backref('data_points', lazy=True))
\ No newline at end of file
+    metric = db.relationship('Metric', backref=db.backref('data_points', lazy=True))
+
+class StockPriceData(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    symbol = db.Column(db.String(20), nullable=False)
+    close = db.Column(db.Float, nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (db.Index('ix_stock_price_symbol_date', 'symbol', 'date'),)
@@ -1,7 +1,9 @@
-from flask import render_template, request, redirect, url_for, flash, jsonify
+from flask import render_template, request, redirect, url_for, flash, jsonify, Response, stream_with_context
 from app import app, db
 from models import Indicator, Metric
 from data_fetcher import DataFetcher
+from db_pool import read_replica, pool_stats
+from analysis import parse_batch_request, load_signal_series, stream_batch_analysis
 
 @app.route('/')
 def index():
@@ -31,6 +33,7 @@ def not_found(error):
     return render_template('index.html'), 404
 
 @app.route('/indicators')
+@read_replica
 def indicators():
     """List all indicators"""
     # Get indicators from database, fallback to static data
@@ -236,6 +239,29 @@ def metric_detail(metric_id):
     
     return render_template('metric_detail.html', metric=metric)
 
+@app.route('/api/analyze/batch', methods=['POST'])
+@read_replica
+def analyze_batch():
+    """Analyze a watchlist of symbols against one indicator or metric, streamed as NDJSON"""
+    try:
+        symbols, indicator_id, metric_id, max_lag = parse_batch_request(request.get_json(silent=True) or {})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    signal_dates, signal_values = load_signal_series(indicator_id=indicator_id, metric_id=metric_id)
+    if len(signal_values) < 2:
+        return jsonify({'error': 'Not enough data for the selected indicator or metric'}), 404
+
+    return Response(
+        stream_with_context(stream_batch_analysis(symbols, signal_dates, signal_values, max_lag)),
+        mimetype='application/x-ndjson'
+    )
+
+@app.route('/admin/pool-stats')
+def pool_stats_view():
+    """Expose database connection pool usage for monitoring"""
+    return jsonify(pool_stats(db.engines))
+
 @app.route('/admin/populate-data')
 def populate_data():
     """Admin route to populate database with indicators and metrics"""
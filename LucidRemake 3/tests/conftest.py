@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+# app.py configures the database at import time, so point the primary and
+# replica at scratch SQLite files before any test module imports it
+DB_DIR = tempfile.mkdtemp(prefix='lucid-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(DB_DIR, 'primary.db')}"
+os.environ['DATABASE_REPLICA_URL'] = f"sqlite:///{os.path.join(DB_DIR, 'replica.db')}"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import the app first, as main.py does, so models and routes register in order
+from app import app, db  # noqa: E402
+from db_pool import REPLICA_BIND_KEY  # noqa: E402
+from models import Indicator, IndicatorData, StockPriceData  # noqa: E402
+
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def engines():
+    """Fresh schema on both SQLite files; the replica gets the same tables"""
+    with app.app_context():
+        primary, replica = db.engines[None], db.engines[REPLICA_BIND_KEY]
+        for engine in (primary, replica):
+            db.metadata.drop_all(bind=engine)
+            db.metadata.create_all(bind=engine)
+        yield primary, replica
+        db.session.remove()
+
+
+BATCH_START = date(2024, 3, 1)
+BATCH_DAYS = 80
+BATCH_SYMBOLS = [f'SYM{i:03d}' for i in range(260)]
+
+
+@pytest.fixture
+def batch_data(engines):
+    """Indicator 1 with daily values, daily prices for BATCH_SYMBOLS and a STALE symbol.
+
+    Prices start ten days before the indicator, inside the price lookback;
+    STALE only has prices from well before it.
+    """
+    rng = np.random.default_rng(11)
+    signal = 100 * np.cumprod(1 + rng.normal(0, 0.02, BATCH_DAYS))
+    indicator_rows = [
+        {'indicator_id': 1, 'value': float(value), 'date': BATCH_START + timedelta(days=i)}
+        for i, value in enumerate(signal)
+    ]
+
+    price_days = BATCH_DAYS + 10
+    price_start = BATCH_START - timedelta(days=10)
+    returns = rng.normal(0, 0.01, (price_days, len(BATCH_SYMBOLS)))
+    prices = 50 * np.cumprod(1 + returns, axis=0)
+    price_rows = [
+        {'symbol': symbol, 'close': float(prices[d, s]), 'date': price_start + timedelta(days=d)}
+        for s, symbol in enumerate(BATCH_SYMBOLS) for d in range(price_days)
+    ]
+    price_rows += [
+        {'symbol': 'STALE', 'close': 10.0 + d, 'date': date(2024, 1, 1) + timedelta(days=d)}
+        for d in range(30)
+    ]
+
+    for engine in engines:
+        with engine.begin() as connection:
+            connection.execute(Indicator.__table__.insert(), {'id': 1, 'name': 'Test Indicator'})
+            connection.execute(IndicatorData.__table__.insert(), indicator_rows)
+            connection.execute(StockPriceData.__table__.insert(), price_rows)
+    return {'indicator_id': 1, 'symbols': BATCH_SYMBOLS}
@@ -0,0 +1,163 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis import align_prices, compute_batch_stats, parse_batch_request
+
+
+def _days(start, count):
+    return [start + timedelta(days=i) for i in range(count)]
+
+
+def _pandas_alignment(rows, symbols, dates):
+    """Reference as-of alignment: last close on or before each date"""
+    frame = pd.DataFrame(rows, columns=['symbol', 'date', 'close'])
+    prices = frame.pivot(index='date', columns='symbol', values='close').reindex(columns=symbols)
+    prices.index = pd.to_datetime(prices.index)
+    targets = pd.to_datetime(dates)
+    return prices.reindex(prices.index.union(targets)).ffill().loc[targets].to_numpy()
+
+
+def _pandas_stats(signal_values, prices, lag):
+    """Reference correlation, beta and hit rate at a fixed lag"""
+    signal = pd.Series(signal_values).pct_change(fill_method=None).iloc[1:].reset_index(drop=True)
+    returns = pd.DataFrame(prices).pct_change(fill_method=None).iloc[1:].reset_index(drop=True)
+    shifted = signal.shift(lag)
+
+    expected = []
+    for column in returns:
+        pair = pd.concat([shifted, returns[column]], axis=1).dropna()
+        x, y = pair.iloc[:, 0], pair.iloc[:, 1]
+        expected.append({
+            'correlation': x.corr(y),
+            'beta': np.cov(x, y, ddof=0)[0, 1] / np.var(x),
+            'hit_rate': ((np.sign(x) == np.sign(y)) & (x != 0)).mean(),
+            'observations': len(pair),
+        })
+    return expected
+
+
+class TestAlignPrices:
+
+    def test_matches_pandas_with_gaps_and_missing_symbols(self):
+        start = date(2024, 1, 1)
+        rows = [('AAA', d, 100.0 + i) for i, d in enumerate(_days(start, 30))]
+        # BBB skips every third day and starts late
+        rows += [('BBB', d, 50.0 + i) for i, d in enumerate(_days(start + timedelta(days=5), 25)) if i % 3]
+        rows.sort(key=lambda row: row[1])
+        symbols = ['AAA', 'BBB', 'CCC']
+        dates = np.array(_days(start, 40)[::4], dtype='datetime64[D]')
+
+        aligned = align_prices(rows, symbols, dates)
+
+        np.testing.assert_allclose(aligned, _pandas_alignment(rows, symbols, dates))
+        assert np.isnan(aligned[:, 2]).all()
+        # Dates past the last price keep the last close
+        assert aligned[-1, 0] == 129.0
+
+    def test_signal_dates_before_any_price_are_nan(self):
+        rows = [('AAA', date(2024, 2, 1), 10.0)]
+        dates = np.array([date(2024, 1, 15), date(2024, 2, 1), date(2024, 2, 9)], dtype='datetime64[D]')
+
+        aligned = align_prices(rows, ['AAA'], dates)
+
+        assert np.isnan(aligned[0, 0])
+        assert aligned[1:, 0].tolist() == [10.0, 10.0]
+
+    def test_no_rows(self):
+        dates = np.array([date(2024, 1, 1), date(2024, 1, 2)], dtype='datetime64[D]')
+
+        assert np.isnan(align_prices([], ['AAA', 'BBB'], dates)).all()
+
+
+class TestComputeBatchStats:
+
+    @pytest.fixture
+    def signal_values(self):
+        rng = np.random.default_rng(7)
+        return 100 * np.cumprod(1 + rng.normal(0, 0.02, 121))
+
+    def test_zero_lag_matches_pandas(self, signal_values):
+        rng = np.random.default_rng(1)
+        prices = 50 * np.cumprod(1 + rng.normal(0, 0.01, (121, 4)), axis=0)
+
+        stats = compute_batch_stats(signal_values, prices, max_lag=0)
+
+        for i, expected in enumerate(_pandas_stats(signal_values, prices, 0)):
+            assert stats['lag'][i] == 0
+            assert stats['observations'][i] == expected['observations']
+            assert stats['correlation'][i] == pytest.approx(expected['correlation'])
+            assert stats['beta'][i] == pytest.approx(expected['beta'])
+            assert stats['hit_rate'][i] == pytest.approx(expected['hit_rate'])
+
+    def test_picks_the_lag_the_signal_leads_by(self, signal_values):
+        rng = np.random.default_rng(2)
+        signal_returns = np.diff(signal_values) / signal_values[:-1]
+        lead = np.concatenate([np.zeros(3), signal_returns[:-3]])
+        returns = 1.5 * lead + rng.normal(0, 0.002, len(lead))
+        prices = 20 * np.cumprod(np.concatenate([[1.0], 1 + returns]))[:, None]
+
+        stats = compute_batch_stats(signal_values, prices, max_lag=5)
+        expected = _pandas_stats(signal_values, prices, 3)[0]
+
+        assert stats['lag'][0] == 3
+        assert stats['correlation'][0] == pytest.approx(expected['correlation'])
+        assert stats['beta'][0] == pytest.approx(expected['beta'])
+        assert stats['beta'][0] == pytest.approx(1.5, abs=0.05)
+
+    def test_nan_prices_use_pairwise_complete_observations(self, signal_values):
+        rng = np.random.default_rng(3)
+        prices = 50 * np.cumprod(1 + rng.normal(0, 0.01, (121, 2)), axis=0)
+        prices[10:15, 0] = np.nan
+        prices[::7, 1] = np.nan
+
+        stats = compute_batch_stats(signal_values, prices, max_lag=0)
+
+        for i, expected in enumerate(_pandas_stats(signal_values, prices, 0)):
+            assert stats['observations'][i] == expected['observations']
+            assert stats['correlation'][i] == pytest.approx(expected['correlation'])
+            assert stats['beta'][i] == pytest.approx(expected['beta'])
+
+    def test_zero_variance_signal_gives_no_result(self):
+        prices = np.linspace(10, 20, 121)[:, None] + np.sin(np.arange(121))[:, None]
+
+        stats = compute_batch_stats(np.full(121, 5.0), prices, max_lag=3)
+
+        assert np.isnan(stats['correlation'][0])
+        assert np.isnan(stats['beta'][0])
+
+    def test_too_few_observations_gives_no_result(self, signal_values):
+        prices = np.full((121, 1), np.nan)
+        prices[-10:, 0] = np.arange(1.0, 11.0)
+
+        stats = compute_batch_stats(signal_values, prices, max_lag=0)
+
+        assert np.isnan(stats['correlation'][0])
+
+
+class TestParseBatchRequest:
+
+    def test_normalizes_symbols(self):
+        symbols, indicator_id, metric_id, max_lag = parse_batch_request(
+            {'symbols': [' aapl', 'AAPL', 'msft '], 'indicator_id': 1}
+        )
+
+        assert symbols == ['AAPL', 'MSFT']
+        assert (indicator_id, metric_id, max_lag) == (1, None, 5)
+
+    @pytest.mark.parametrize('payload', [
+        [],
+        {'symbols': [' '], 'indicator_id': 1},
+        {'symbols': [{}], 'indicator_id': 1},
+        {'symbols': ['A'], 'indicator_id': 'x'},
+        {'symbols': ['A'], 'indicator_id': True},
+        {'symbols': ['A'], 'indicator_id': 1, 'metric_id': 1},
+        {'symbols': ['A'], 'indicator_id': 1, 'max_lag': True},
+        {'symbols': ['A'], 'indicator_id': 1, 'max_lag': 10 ** 9},
+        {'symbols': ['A'], 'indicator_id': 1, 'max_lag': -1},
+    ])
+    def test_rejects_invalid_payloads(self, payload):
+        with pytest.raises(ValueError):
+            parse_batch_request(payload)
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import logging
+
+import httpx
+import pytest
+
+from analysis import BATCH_CHUNK_SIZE
+from app import app as flask_app
+from asgi import app as asgi_app, read_engine
+from db_pool import pool_stats
+
+
+def _run(test):
+    """Run a test coroutine, then dispose the async engine on the same event loop.
+
+    Pooled connections belong to the loop that opened them, so each test
+    starts from an empty pool.
+    """
+    async def main():
+        try:
+            return await test()
+        finally:
+            await read_engine.dispose()
+    return asyncio.run(main())
+
+
+def _request(method, url, **kwargs):
+    async def test():
+        transport = httpx.ASGITransport(app=asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://testserver') as client:
+            return await client.request(method, url, **kwargs)
+    return _run(test)
+
+
+def _async_pool():
+    return pool_stats({'async_read': read_engine.sync_engine})['async_read']
+
+
+def test_disconnect_mid_stream_returns_the_connection(batch_data, caplog):
+    symbols = batch_data['symbols'] + [f'EXTRA{i:04d}' for i in range(1500)]
+    body = json.dumps({'symbols': symbols, 'indicator_id': batch_data['indicator_id']}).encode()
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0', 'spec_version': '2.3'},
+        'http_version': '1.1',
+        'method': 'POST',
+        'scheme': 'http',
+        'path': '/api/analyze/batch',
+        'raw_path': b'/api/analyze/batch',
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'content-type', b'application/json')],
+        'server': ('testserver', 80),
+        'client': ('testclient', 50000),
+    }
+    chunks = []
+
+    async def test():
+        first_chunk_sent = asyncio.Event()
+        requests = [{'type': 'http.request', 'body': body, 'more_body': False}]
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            # The client goes away as soon as the first results arrive
+            await first_chunk_sent.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.body' and message.get('body'):
+                chunks.append(message['body'])
+                first_chunk_sent.set()
+
+        await asgi_app(scope, receive, send)
+        return _async_pool()
+
+    with caplog.at_level(logging.WARNING):
+        stats = _run(test)
+
+    lines = b''.join(chunks).decode().splitlines()
+    assert BATCH_CHUNK_SIZE <= len(lines) < len(symbols)
+    assert stats['checked_out'] == 0
+    assert stats['checked_in'] == 1
+    assert not [record for record in caplog.records if record.levelno >= logging.WARNING]
+
+
+def test_batch_matches_the_flask_endpoint_line_for_line(batch_data):
+    symbols = [symbol.lower() for symbol in reversed(batch_data['symbols'])] + ['NOPRICE', 'STALE']
+    payload = {'symbols': symbols, 'indicator_id': batch_data['indicator_id'], 'max_lag': 3}
+
+    response = _request('POST', '/api/analyze/batch', json=payload)
+    expected = flask_app.test_client().post('/api/analyze/batch', json=payload)
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    assert len(response.text.splitlines()) == len(symbols)
+    assert response.text.splitlines() == expected.get_data(as_text=True).splitlines()
+
+
+@pytest.mark.parametrize('payload', [
+    {'symbols': [], 'indicator_id': 1},
+    {'symbols': ['SYM000'], 'indicator_id': 'x'},
+    {'symbols': ['SYM000'], 'indicator_id': 1, 'max_lag': 31},
+    ['SYM000'],
+])
+def test_batch_rejects_bad_payloads(batch_data, payload):
+    response = _request('POST', '/api/analyze/batch', json=payload)
+
+    assert response.status_code == 400
+    assert 'error' in response.json()
+
+
+def test_batch_rejects_malformed_json(batch_data):
+    response = _request('POST', '/api/analyze/batch', content=b'{not json',
+                        headers={'content-type': 'application/json'})
+
+    assert response.status_code == 400
+    assert 'error' in response.json()
+
+
+def test_batch_unknown_indicator_is_404(batch_data):
+    response = _request('POST', '/api/analyze/batch', json={'symbols': ['SYM000'], 'indicator_id': 999})
+
+    assert response.status_code == 404
+    assert 'error' in response.json()
+
+
+def test_pool_stats_include_the_async_read_engine():
+    response = _request('GET', '/admin/pool-stats')
+
+    assert response.status_code == 200
+    stats = response.json()
+    assert {'primary', 'replica', 'async_read'} <= set(stats)
+    assert stats['async_read']['pool_class'] == 'TimedAsyncQueuePool'
+
+
+def test_other_paths_fall_through_to_flask():
+    response = _request('GET', '/explore')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/html')
@@ -0,0 +1,68 @@
+import json
+from datetime import date
+
+import pytest
+
+from analysis import BATCH_CHUNK_SIZE, PRICE_LOOKBACK_DAYS, price_query
+from app import app, db
+
+
+def _post_batch(payload):
+    response = app.test_client().post('/api/analyze/batch', json=payload)
+    return response, [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_batch_streams_one_line_per_symbol_in_input_order(batch_data):
+    # Reversed, lower-cased and spanning more than one chunk
+    symbols = [symbol.lower() for symbol in reversed(batch_data['symbols'])] + ['NOPRICE', 'STALE']
+    assert len(symbols) > BATCH_CHUNK_SIZE
+
+    response, lines = _post_batch({'symbols': symbols, 'indicator_id': batch_data['indicator_id']})
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert [line['symbol'] for line in lines] == [symbol.upper() for symbol in symbols]
+    for line in lines[:-2]:
+        assert set(line) == {'symbol', 'correlation', 'lag', 'beta', 'hit_rate', 'observations'}
+        assert -1 <= line['correlation'] <= 1
+        assert 0 <= line['lag'] <= 5
+        # Prices start inside the lookback, so every signal date has a close
+        assert line['observations'] >= 79 - line['lag']
+    assert lines[-2] == {'symbol': 'NOPRICE', 'error': 'Insufficient price data'}
+    assert lines[-1] == {'symbol': 'STALE', 'error': 'Insufficient price data'}
+
+
+def test_price_query_is_bounded_by_the_lookback(batch_data):
+    first, last = date(2024, 3, 1), date(2024, 5, 19)
+
+    with app.app_context():
+        rows = db.session.execute(price_query(['SYM000', 'STALE'], first, last)).all()
+
+    assert {row.symbol for row in rows} == {'SYM000'}
+    assert min(row.date for row in rows) == date(2024, 2, 20)
+    assert (first - min(row.date for row in rows)).days <= PRICE_LOOKBACK_DAYS
+
+
+@pytest.mark.parametrize('payload', [
+    {'symbols': [], 'indicator_id': 1},
+    {'symbols': ['SYM000'], 'indicator_id': 'x'},
+    {'symbols': ['SYM000'], 'indicator_id': 1, 'max_lag': 31},
+    ['SYM000'],
+])
+def test_batch_rejects_bad_payloads(batch_data, payload):
+    response = app.test_client().post('/api/analyze/batch', json=payload)
+
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_batch_rejects_malformed_json(batch_data):
+    response = app.test_client().post('/api/analyze/batch', data='{not json', content_type='application/json')
+
+    assert response.status_code == 400
+
+
+def test_batch_unknown_indicator_is_404(batch_data):
+    response = app.test_client().post('/api/analyze/batch', json={'symbols': ['SYM000'], 'indicator_id': 999})
+
+    assert response.status_code == 404